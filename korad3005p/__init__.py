@@ -1,6 +1,9 @@
 from . import korad3005p
+from . import multi
 from . import util
 
 Korad3005p = korad3005p.Korad3005p
+Status = korad3005p.Status
+MultiKorad = multi.MultiKorad
 flatten_dict = util.flatten_dict
 listify_dict = util.listify_dict
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-import datetime
+import dataclasses
 import re
 import serial
 import time
@@ -19,12 +19,137 @@ Commands cribbed from:
 """
 
 
+# the fixed-string commands, pre-encoded once at import; the toggles
+# and memory methods just index and write
+_OUT_B = (b'OUT0\n', b'OUT1\n')
+_OVP_B = (b'OVP0\n', b'OVP1\n')
+_OCP_B = (b'OCP0\n', b'OCP1\n')
+_SAV_B = (None, b'SAV1\n', b'SAV2\n', b'SAV3\n', b'SAV4\n', b'SAV5\n')
+_RCL_B = (None, b'RCL1\n', b'RCL2\n', b'RCL3\n', b'RCL4\n', b'RCL5\n')
+
+# decode tables for the STATUS? byte, indexed by the relevant bits
+_CH_MODE  = ('CC','CV')
+_TRACKING = ('independent','series','series','parallel')
+
+# the full status query batch and its reply shape: 1 raw status byte
+# followed by four 5-char numbers ("05.00"), no terminators
+_STATUS_QUERIES = ('STATUS?','VSET1?','ISET1?','VOUT1?','IOUT1?')
+_STATUS_QUERY_B = b'STATUS?\nVSET1?\nISET1?\nVOUT1?\nIOUT1?\n'
+_STATUS_REPLY_LEN = 1 + 4 * 5
+
+
+def _timestamps():
+    # cheaper than datetime.now()/isoformat at high sample rates;
+    # the iso field carries second resolution, epoch the full float
+    ts = time.time()
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(ts)), ts
+
+
+# One status() reading. Slots keep per-sample allocation down versus
+# the nested dicts this used to return, and frozen means the instance
+# the TTL cache hands to several callers can't be corrupted by any of
+# them; to_dict() rebuilds the old shape for JSON/printing callers.
+@dataclasses.dataclass(frozen=True, slots=True)
+class Status:
+    ch0_mode: str
+    ch1_mode: str
+    tracking: str
+    beep: bool
+    lock: bool
+    output: bool
+    vset: float
+    iset: float
+    vout: float
+    iout: float
+    power: float
+    model: str
+    version: str
+    serial: str
+    iso: str
+    epoch: float
+
+    # flat (label, attribute) layout matching what flatten_dict made
+    # of the old nested dict, so CSV headers stay stable
+    _FLAT = (
+        ('hw_model', 'model'),
+        ('hw_serial', 'serial'),
+        ('hw_version', 'version'),
+        ('output_curr', 'iout'),
+        ('output_power', 'power'),
+        ('output_volts', 'vout'),
+        ('settings_curr', 'iset'),
+        ('settings_volts', 'vset'),
+        ('status_beep', 'beep'),
+        ('status_ch0_mode', 'ch0_mode'),
+        ('status_ch1_mode', 'ch1_mode'),
+        ('status_lock', 'lock'),
+        ('status_output', 'output'),
+        ('status_tracking', 'tracking'),
+        ('time_epoch', 'epoch'),
+        ('time_iso', 'iso'),
+    )
+    FLAT_KEYS = tuple(k for k, a in _FLAT)
+
+    def flat_values(self):
+        return [getattr(self, a) for k, a in self._FLAT]
+
+    def to_dict(self):
+        return {
+            'status': {
+                'ch0_mode': self.ch0_mode,
+                'ch1_mode': self.ch1_mode,
+                'tracking': self.tracking,
+                'beep': self.beep,
+                'lock': self.lock,
+                'output': self.output,
+            },
+            'settings': {
+                'volts': self.vset,
+                'curr': self.iset,
+            },
+            'output': {
+                'volts': self.vout,
+                'curr': self.iout,
+                'power': self.power,
+            },
+            'hw': {
+                'version': self.version,
+                'model': self.model,
+                'serial': self.serial,
+            },
+            'time': {
+                'iso': self.iso,
+                'epoch': self.epoch,
+            },
+        }
+
+
 class Korad3005p(object):
-    def __init__(self, port = 'COM3', speed = 9600, timeout=2):
+    def __init__(self, port = 'COM3', speed = 9600, timeout=2, low_latency=True,
+                 status_ttl=0.1):
         self.s = serial.Serial(port, speed, timeout=timeout)
-        self._cmdb('')
+        if low_latency:
+            # FTDI-style USB-serial bridges buffer replies for ~16 ms
+            # before flushing them to the host; asking the driver for
+            # low-latency mode cuts that to ~1 ms per command. Not all
+            # ports/platforms support it (pyserial's win32 backend
+            # doesn't even have the method), so failure is not fatal.
+            try:
+                self.s.set_low_latency_mode(True)
+            except (AttributeError, ValueError, NotImplementedError, IOError):
+                pass
+        self._status_ttl = status_ttl
+        self._status_cache = None
+        # clear any stale bytes in either direction; unlike the old
+        # empty-command probe this doesn't sit out a read timeout
+        self.s.reset_input_buffer()
+        self.s.reset_output_buffer()
+        # probe with a short dedicated timeout so a missing or wedged
+        # PSU fails fast, then restore the caller's timeout
+        self.s.timeout = 0.3
         init_str = self._cmds('*IDN?')
-        if init_str is None:
+        self.s.timeout = timeout
+        if not init_str:
             raise Exception('Could not get response from PSU')
 
         m = re.search(r'KORAD KA(\d+)P V(\d+\.?\d+) SN:(\d+)', init_str)
@@ -36,52 +161,68 @@ class Korad3005p(object):
             'serial':  m[3],
         }
 
-    def _append10(self, c, t):
-        return ''.join([c,'1' if t else '0'])
-
-    def enable(self, on=True): 
-        self._cmdbn(self._append10('OUT',on))
+    def enable(self, on=True):
+        self._status_cache = None
+        self.s.write(_OUT_B[bool(on)])
 
     def disable(self, off=True):
         self.enable(on = not off)
 
     def enableOVP(self, on=True):
-        self._cmdbn(self._append10('OVP',on))
+        self.s.write(_OVP_B[bool(on)])
 
     def enableOCP(self, on=True):
-        self._cmdbn(self._append10('OCP',on))
+        self.s.write(_OCP_B[bool(on)])
 
     def setVolts(self, v):
-        self._cmdbn(f'VSET1:{v:.2f}')
+        self._status_cache = None
+        self._cmdbn('VSET1:%.2f' % v)
 
     def setCurr(self, i = 0):
-        self._cmdbn(f'ISET1:{i:.2f}')
+        self._status_cache = None
+        self._cmdbn('ISET1:%.2f' % i)
 
     def _slew(self, what, end, count, duration):
         s = self.status()
-        start = s['settings'][what]
 
-        incr = (end - start) / count
         time_step = duration / count
-        v = start
 
         fn = None
         if what == 'volts':
             fn = self.setVolts
+            fmt = 'VSET1:%.2f\n'
+            start = s.vset
         elif what == 'curr':
             fn = self.setCurr
+            fmt = 'ISET1:%.2f\n'
+            start = s.iset
         else:
             raise Exception(f'No function found. What was {what}')
 
-        for i in range(count):
-            v += incr
-            v = int(v * 1000 + 0.5) / 1000
-            if fn:
-                fn(v)
-            time.sleep(time_step)
+        # precompute the whole setpoint ladder in integer millivolts/
+        # milliamps; no accumulated float error, and the last step
+        # lands exactly on the endpoint
+        steps = [
+            round(start * 1000 + (end - start) * 1000 * (i + 1) / count)
+                for i in range(count)
+        ]
+
+        if time_step < 0.001:
+            # the per-step sleeps are no-ops at this step size; send
+            # the whole ladder as one write instead of one per step
+            self._status_cache = None
+            self._cmd_bulk([
+                (fmt % (step / 1000)).encode('ascii') for step in steps
+            ])
+            return
 
-        if fn:
-            fn(end)
+        # absolute deadlines rather than fixed sleeps, so the time
+        # spent in the serial commands doesn't stretch the slew
+        t0 = time.monotonic()
+        for i, step in enumerate(steps):
+            fn(step / 1000)
+            deadline = t0 + (i + 1) * time_step
+            time.sleep(max(0, deadline - time.monotonic()))
 
     def slewVolts(self, end_v, count = 20, duration = 5):
         return self._slew('volts', end_v, count, duration)
@@ -91,11 +232,12 @@ class Korad3005p(object):
 
     def m_store(self, n):
         if (n > 0) and (n <= 5):
-            self._cmdbn(f'SAV{n}')
+            self.s.write(_SAV_B[n])
 
     def m_recall(self, n):
         if (n > 0) and (n <= 5):
-            self._cmdbn(f'RCL{n}')
+            self._status_cache = None
+            self.s.write(_RCL_B[n])
 
     def showTime(self):
         self.disable()
@@ -106,45 +248,74 @@ class Korad3005p(object):
         self.setVolts(t_num)
         self.setCurr(i_num)
 
-    def status(self):
-        s = self._cmdb('STATUS?')
-        if s is None:
-           raise Exception('Could not get PSU status')
-        s_byte = s[0]
+    def status(self, force=False):
+        # recent results are served from a short-TTL cache so several
+        # accesses in one callsite share a single round-trip; setters
+        # invalidate it, and force=True always hits the hardware. The
+        # cached object is returned as-is -- callers may still be
+        # holding it, and its timestamps say when the values were
+        # actually measured
+        if not force and self._status_cache is not None:
+            ts, cached = self._status_cache
+            if time.monotonic() - ts < self._status_ttl:
+                return cached
 
-        now = datetime.datetime.now()
-        timestamps = {
-            'iso': now.isoformat(),
-            'epoch': now.timestamp(),
-        }
+        # one write carrying all five queries, then one read of the
+        # whole fixed-width reply blob, sliced positionally; no
+        # per-field framing or decode passes
+        self.s.write(_STATUS_QUERY_B)
+        blob = self.s.read(_STATUS_REPLY_LEN)
+        try:
+            if len(blob) != _STATUS_REPLY_LEN:
+                raise ValueError('short status reply')
+            s_byte = blob[0]
+            vset = float(blob[1:6])
+            iset = float(blob[6:11])
+            vout = float(blob[11:16])
+            iout = float(blob[16:21])
+        except ValueError:
+            # short or misaligned reply (e.g. stale bytes left over
+            # from an earlier timeout); drop whatever arrived and redo
+            # the queries with per-reply fixed-size framing
+            self.s.reset_input_buffer()
+            replies = self._cmd_many(
+                list(_STATUS_QUERIES),
+                sizes=(1, 5, 5, 5, 5),
+            )
+            if not replies[0]:
+               raise Exception('Could not get PSU status')
+            s_byte = replies[0][0]
+            try:
+                vset = float(replies[1])
+                iset = float(replies[2])
+                vout = float(replies[3])
+                iout = float(replies[4])
+            except ValueError:
+                # still short or garbled; nothing sane to report
+                raise Exception('Could not get PSU status')
 
-        trk_bits = (s_byte >> 2) & 0x3
-        status = {
-            'ch0_mode': 'CV' if s_byte & 0x1 else 'CC',
-            'ch1_mode': 'CV' if s_byte & 0x2 else 'CC',
-            'tracking': 'independent' if trk_bits == 0 else ('parallel' if trk_bits == 0x3 else 'series'),
-            'beep': True if s_byte & 0x10 else False,
-            'lock': True if s_byte & 0x20 else False,
-            'output': True if s_byte & 0x40 else False,
-        }
-        settings = {
-            'volts': float(self._cmds('VSET1?')),
-            'curr': float(self._cmds('ISET1?')),
-        }
-        v = float(self._cmds('VOUT1?'))
-        i = float(self._cmds('IOUT1?'))
-        output = {
-            'volts': v,
-            'curr': i,
-            'power': v * i,
-        }
-        return {
-            'status': status,
-            'settings': settings,
-            'output': output,
-            'hw': self.hw,
-            'time': timestamps,
-        }
+        iso, epoch = _timestamps()
+
+        result = Status(
+            ch0_mode = _CH_MODE[s_byte & 0x1],
+            ch1_mode = _CH_MODE[(s_byte >> 1) & 0x1],
+            tracking = _TRACKING[(s_byte >> 2) & 0x3],
+            beep = bool(s_byte & 0x10),
+            lock = bool(s_byte & 0x20),
+            output = bool(s_byte & 0x40),
+            vset = vset,
+            iset = iset,
+            vout = vout,
+            iout = iout,
+            power = vout * iout,
+            model = self.hw['model'],
+            version = self.hw['version'],
+            serial = self.hw['serial'],
+            iso = iso,
+            epoch = epoch,
+        )
+        self._status_cache = (time.monotonic(), result)
+        return result
 
     def _cmdbn(self,c):
         s = c + '\n'
@@ -156,6 +327,20 @@ class Korad3005p(object):
         self._cmdbn(c)
         return self.s.readline()
 
+    def _cmd_bulk(self, cmds):
+        # many pre-encoded commands in a single write/syscall; only
+        # for commands that produce no reply
+        self.s.write(b''.join(cmds))
+
+    def _cmd_many(self, cmds, sizes):
+        # one write carrying several commands, then a fixed-size read
+        # per reply. The PSU sends no terminators, so batched replies
+        # can only be framed by their known sizes; readline() would
+        # lump them together after waiting out the timeout.
+        b = b'\n'.join([c.encode('ascii',errors='ignore') for c in cmds]) + b'\n'
+        self.s.write(b)
+        return [self.s.read(n) for n in sizes]
+
     def _cmds(self, c):
         return self._cmdb(c).decode('ascii',errors='ignore')
 
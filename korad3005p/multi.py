@@ -0,0 +1,41 @@
+
+import concurrent.futures
+
+from .korad3005p import Korad3005p
+
+# Drives several PSUs at once. Each unit sits on its own serial port
+# and the blocking I/O happens in OS read()/write(), so a thread per
+# unit overlaps the round-trips and N-supply operations take about as
+# long as one.
+
+
+class MultiKorad(object):
+    def __init__(self, ports, **kwargs):
+        self.units = [Korad3005p(p, **kwargs) for p in ports]
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=len(self.units))
+
+    def _fanout(self, name, *args, **kwargs):
+        futures = [
+            self._pool.submit(getattr(k, name), *args, **kwargs)
+                for k in self.units
+        ]
+        return [f.result() for f in futures]
+
+    def status_all(self, force=False):
+        return self._fanout('status', force=force)
+
+    def enable_all(self, on=True):
+        return self._fanout('enable', on)
+
+    def disable_all(self, off=True):
+        return self._fanout('disable', off)
+
+    def setVolts_all(self, v):
+        return self._fanout('setVolts', v)
+
+    def setCurr_all(self, i=0):
+        return self._fanout('setCurr', i)
+
+    def close(self):
+        self._pool.shutdown()
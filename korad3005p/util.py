@@ -8,10 +8,46 @@ def flatten_dict(dd, separator='_', prefix=''):
         prefix : dd
     }
 
+# The status() schema never changes between samples, so the recursive
+# flatten + sort only needs to happen once. _compile_flattener walks
+# the dict a single time and generates a flat extractor function with
+# the subscript paths baked in; listify_dict reuses it for every row
+# whose schema matches. The schema check is a cheap key-structure walk
+# (no label strings, no sort) so a dict with extra or missing keys
+# gets a fresh compile instead of silently wrong output.
+
+_flattener = None
+
+def _schema(dd):
+    return tuple(
+        (k, _schema(v)) if isinstance(v, dict) else k
+            for k, v in dd.items()
+    )
+
+def _paths(dd, prefix=()):
+    for k, v in dd.items():
+        if isinstance(v, dict):
+            yield from _paths(v, prefix + (k,))
+        else:
+            yield prefix + (k,), '_'.join(prefix + (k,))
+
+def _compile_flattener(dd):
+    by_label = sorted(_paths(dd), key=lambda p: p[1])
+    keys = [label for path, label in by_label]
+    subscripts = ','.join(
+        'd' + ''.join(f'[{k!r}]' for k in path) for path, label in by_label
+    )
+    extractor = eval(f'lambda d: [{subscripts}]')
+    return keys, extractor
+
 def listify_dict(data, labels_only=False):
-    flat = flatten_dict(data)
-    keys = sorted(flat.keys())
-    if labels_only:
-        return keys
-    return [ flat[k] for k in keys ]
+    # Status objects carry their own precomputed flat layout
+    if hasattr(data, 'flat_values'):
+        return list(data.FLAT_KEYS) if labels_only else data.flat_values()
+    global _flattener
+    schema = _schema(data)
+    if _flattener is None or _flattener[0] != schema:
+        _flattener = (schema,) + _compile_flattener(data)
+    _, keys, extractor = _flattener
+    return keys if labels_only else extractor(data)
 
@@ -3,7 +3,6 @@
 import argparse
 import csv
 import time
-import re
 import signal
 import sys
 
@@ -128,22 +127,42 @@ class KoradLipoCharger(object):
         end_time = now + self.args.max_time * 3600
 
         time.sleep(1)
-        
+
+        # adaptive check cadence: deep in CC the current is pinned to
+        # the setpoint, so the interval backs off; near the CC->CV
+        # transition and end-of-charge it tightens back up
+        base_interval = self.args.check_interval
+        interval = base_interval
+        prev_curr = None
+        prev_mode = None
+
         first_iter = True
         while not finished and now < end_time:
             s = self.k.status()
-            time_iso = re.sub(r'\.\d+','',s['time']['iso'])
-            print(f"    {time_iso} {s['status']['ch0_mode']} {s['output']['volts']:.3f} V, {s['output']['curr']:.3f} A")
+            curr = s.iout
+            mode = s.ch0_mode
+            print(f"    {s.iso} {mode} {s.vout:.3f} V, {curr:.3f} A")
             if self.csvw:
                 if first_iter:
                     self.csvw.writerow(korad3005p.listify_dict(s,True))
                     first_iter = False
                 self.csvw.writerow(korad3005p.listify_dict(s,False))
 
-            if s['output']['curr'] <= eoc_current:
+            if curr <= eoc_current:
                 finished = True
             else:
-                time.sleep(self.args.check_interval)
+                if prev_curr is not None and cc_current > 0:
+                    # normalized by the CC setpoint, which is a stable
+                    # reference and nonzero even with --cutoff 0
+                    delta = abs(curr - prev_curr) / cc_current
+                    if mode != prev_mode or delta > 0.10:
+                        interval = base_interval / 4
+                    elif delta < 0.02:
+                        interval = min(interval * 2, base_interval * 4)
+                prev_curr = curr
+                prev_mode = mode
+                time.sleep(interval)
+                now = time.time()
 
         self.k.disable()
         if self.ofh:
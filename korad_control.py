@@ -136,7 +136,7 @@ class KoradApp(object):
         return parser.parse_args()
        
     def showStatus(self):
-        s = self.k.status()
+        s = self.k.status().to_dict()
         f0 = 'Hardware : Model {model} / FW Ver {version} / Serial# {serial}'
         print(f0.format(**s['hw']))
         f1 = 'Set      : {volts:.2f} V, {curr:.3f} A'
@@ -170,13 +170,13 @@ class KoradApp(object):
         if self.args.ovp_on:
             self.k.enableOVP(True)
 
-        if self.args.ovp_on:
+        if self.args.ovp_off:
             self.k.enableOVP(False)
 
         if self.args.ocp_on:
             self.k.enableOCP(True)
 
-        if self.args.ocp_on:
+        if self.args.ocp_off:
             self.k.enableOCP(False)
 
         if self.args.recall is not None:
@@ -186,7 +186,7 @@ class KoradApp(object):
             self.k.m_store(self.args.store)
 
         if self.args.json:
-            print(json.dumps(self.k.status(), indent=2, sort_keys=True))
+            print(json.dumps(self.k.status().to_dict(), indent=2, sort_keys=True))
         if self.args.status:
             self.showStatus()
 
@@ -195,12 +195,6 @@ class KoradApp(object):
                 self.k.showTime()
                 time.sleep(1)
 
-     
-    def enableOVP(self, on=True):
-        self._cmdbn(self._append10('OVP',on))
-
-    def enableOCP(self, on=True):
-        self._cmdbn(self._append10('OCP',on))
 
 if __name__ == '__main__':
 
@@ -1,12 +1,15 @@
 #!/usr/bin/env python3
 
 import argparse
+import atexit
 import csv
 import datetime
 import json
+import queue
 import re
 import signal
 import sys
+import threading
 import time
 
 import korad3005p
@@ -19,14 +22,31 @@ import korad3005p
 # Free to use by any and all, with attribution.
 
 class KoradCsvApp(object):
+
+    # rows accumulate in memory and hit the file in blocks this big,
+    # to amortize the per-write formatting and syscall cost
+    FLUSH_ROWS = 64
+
     def __init__(self):
         self.args = self.getArgs()
         self.k = korad3005p.Korad3005p(self.args.port, self.args.speed, self.args.timeout)
         signal.signal(signal.SIGINT, self.graceful_exit)
+        self.ofh = None
+        self.csvw = None
+        self.rowbuf = []
+        self.rowfmt = None
+        self.samples = None
+        self.writer = None
 
     def graceful_exit(self, signum, frame):
         print('Caught SIGINT. Exiting')
         try:
+            # stop the writer thread before touching the buffer or the
+            # file, so it can't append mid-flush or write after close
+            if self.writer and self.writer.is_alive():
+                self.samples.put(None)
+                self.writer.join(timeout=2)
+            self.flushRows()
             self.ofh.close()
         except Exception as e:
             pass
@@ -81,36 +101,91 @@ class KoradCsvApp(object):
             help='how long to run in seconds',
         )
 
+        parser.add_argument(
+            '--safe-csv',
+            action='store_true',
+            help='use the csv module (slower, but quotes odd values)',
+        )
+
         return parser.parse_args()
        
+    def flushRows(self):
+        if self.rowbuf and self.ofh and not self.ofh.closed:
+            self.ofh.write(b''.join(self.rowbuf))
+            self.rowbuf.clear()
+
     def writeLine(self, data, first=False):
+        values = korad3005p.listify_dict(data, labels_only=False)
+        if self.csvw:
+            if first:
+                self.csvw.writerow(korad3005p.listify_dict(data, labels_only=True))
+            self.csvw.writerow(values)
+            return
         if first:
-            self.csvw.writerow(korad3005p.listify_dict(data, labels_only=True))
-        self.csvw.writerow(korad3005p.listify_dict(data, labels_only=False))
+            labels = korad3005p.listify_dict(data, labels_only=True)
+            self.rowbuf.append((','.join(labels) + '\n').encode('ascii'))
+            # the schema is fixed, so build one bytes %-template from
+            # the first row's types: floats go through the C formatter,
+            # everything else is stringified and substituted as bytes
+            self.rowfmt = b','.join(
+                b'%.3f' if isinstance(v, float) else b'%s' for v in values
+            ) + b'\n'
+        self.rowbuf.append(self.rowfmt % tuple(
+            v if isinstance(v, float) else str(v).encode('ascii')
+                for v in values
+        ))
+        if len(self.rowbuf) >= self.FLUSH_ROWS:
+            self.flushRows()
 
     def go(self):
 
-        with open(self.args.output, 'w', newline='', encoding='utf-8') as self.ofh:
+        if self.args.safe_csv:
+            ofh = open(self.args.output, 'w', newline='', encoding='utf-8',
+                       buffering=65536)
+            self.csvw = csv.writer(ofh)
+        else:
+            ofh = open(self.args.output, 'wb', buffering=65536)
+
+        with ofh as self.ofh:
             print(f'Opened file: {self.args.output}')
             print(f'Sampling at {self.args.rate:.2f} Hz for {self.args.duration} seconds')
 
-            self.csvw = csv.writer(self.ofh)
+            atexit.register(self.flushRows)
+
+            # formatting and writing rows happens on its own thread so
+            # the sampling loop only pays for the serial round-trip;
+            # at high rates the CSV work overlaps the next sample
+            self.samples = queue.Queue()
+
+            def drain():
+                first = True
+                while True:
+                    data = self.samples.get()
+                    if data is None:
+                        break
+                    self.writeLine(data, first)
+                    first = False
+
+            self.writer = threading.Thread(target=drain, daemon=True)
+            self.writer.start()
 
-            now      = time.time()
+            # monotonic so the cadence is immune to wall-clock jumps
+            now      = time.monotonic()
             end      = now + self.args.duration
             period   = 1.0 / self.args.rate
             deadline = now + period
 
-            first = True
             while now < end:
-                now = time.time()
-                self.writeLine(self.k.status(), first)
-                first = False
+                now = time.monotonic()
+                self.samples.put(self.k.status(force=True))
                 sleep_time = deadline - now
                 deadline += period
                 if sleep_time > 0:
                     time.sleep(sleep_time)
 
+            self.samples.put(None)
+            self.writer.join()
+            self.flushRows()
             print('Done')
 
 